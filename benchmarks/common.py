@@ -0,0 +1,66 @@
+"""Shared setup and statistics helpers for the offline benchmarks."""
+import math
+import os
+import resource
+from typing import Dict, List, Optional
+
+from benchmarks.fakes import FakeRedis, FakeSerpApiServer, HashEncoder, ScriptedChatModel
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+def max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def start_offline_services(serp_latency: float = 0.0) -> FakeSerpApiServer:
+    """Starts the fake SerpApi and points the MCP server's search tool at it."""
+    serp = FakeSerpApiServer(latency=serp_latency).start()
+    os.environ["SERPAPI_KEY"] = "offline"
+    os.environ["SERPAPI_BASE_URL"] = serp.url
+    # The fakes live in this process, so the tool server must as well
+    os.environ.setdefault("MCP_TRANSPORT", "inprocess")
+    return serp
+
+def build_offline_agent(llm_latency: float = 0.0, memory=None, prefetch: Optional[bool] = None, answer_cache: Optional[bool] = None):
+    """ProfessionalHotelAgent wired to the scripted LLM and in-memory Redis."""
+    from src.agent_graph import ProfessionalHotelAgent
+    from src.mcp_bridge import MCPClientManager
+    from src.memory import RedisMemory
+
+    if prefetch is not None:
+        os.environ["SPECULATIVE_PREFETCH"] = "1" if prefetch else "0"
+    if answer_cache is not None:
+        os.environ["SEMANTIC_CACHE"] = "1" if answer_cache else "0"
+
+    memory = memory or RedisMemory(redis_client=FakeRedis(), encoder=HashEncoder())
+    return ProfessionalHotelAgent(
+        memory=memory,
+        mcp_manager=MCPClientManager(server_script_path="src/server.py"),
+        llm=ScriptedChatModel(latency=llm_latency),
+    )
+
+def turn_tokens(messages) -> Dict[str, int]:
+    """Sums LLM token usage over AI messages."""
+    totals = {"input_tokens": 0, "output_tokens": 0}
+    for msg in messages:
+        usage = getattr(msg, "usage_metadata", None)
+        if msg.type == "ai" and usage:
+            totals["input_tokens"] += usage.get("input_tokens", 0)
+            totals["output_tokens"] += usage.get("output_tokens", 0)
+    return totals
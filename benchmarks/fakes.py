@@ -0,0 +1,308 @@
+"""
+Deterministic local stand-ins for the agent's external services:
+
+    ScriptedChatModel  - LangChain chat model that emits `search_hotels(_multi)` tool calls
+    FakeSerpApiServer  - HTTP server answering the SerpApi Google Hotels endpoint
+    FakeRedis          - in-memory subset of redis-py + RediSearch used by RedisMemory
+    HashEncoder        - bag-of-words hashing encoder in place of SentenceTransformer
+"""
+import asyncio
+import fnmatch
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.intent import extract_intent, extract_places, extract_qualifiers
+
+def _count_tokens(text: str) -> int:
+    # Rough whitespace tokenisation; only relative changes matter for benchmarks
+    return len(str(text).split())
+
+# --- LLM ---
+
+AMENITIES = {"breakfast", "pool", "spa", "onsen", "gym", "parking"}
+
+def _llm_query(text: str, place: str) -> str:
+    """Phrases a search_hotels query the way Gemini does: qualifiers kept, wording varied."""
+    qualifiers = extract_qualifiers(text)
+    if qualifiers:
+        before = " ".join(q for q in qualifiers if q not in AMENITIES)
+        after = " and ".join(q for q in qualifiers if q in AMENITIES)
+        return f"{before} hotels in {place}".strip() + (f" with {after}" if after else "")
+    # Unqualified searches come back as the bare place or wrapped in "hotels in"
+    return place if int(hashlib.md5(text.encode()).hexdigest(), 16) % 2 else f"hotels in {place}"
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Plays the agent's most common turn shapes without a network call:
+    a user message naming a place and dates -> `search_hotels` tool call
+    (phrased like the real model, e.g. "cheap hotels in Osaka"),
+    "compare" with several places and dates -> `search_hotels_multi` tool call,
+    a search result -> final answer listing the top 3 hotels,
+    anything else -> a clarifying question.
+    """
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        last = messages[-1]
+        prompt_tokens = sum(_count_tokens(m.content) for m in messages)
+
+        if isinstance(last, HumanMessage) and (intent := extract_intent(last.content)) and intent["check_in"]:
+            call_id = hashlib.md5(f"{len(messages)}:{last.content}".encode()).hexdigest()[:12]
+            places = extract_places(last.content)
+            if "compare" in last.content.lower() and len(places) > 1:
+                args = {"queries": places, "check_in": intent["check_in"], "check_out": intent["check_out"]}
+                call = {"name": "search_hotels_multi", "args": args, "id": call_id}
+            else:
+                args = {**intent, "query": _llm_query(last.content, intent["query"])}
+                call = {"name": "search_hotels", "args": args, "id": call_id}
+            message = AIMessage(content="", tool_calls=[call])
+        elif isinstance(last, ToolMessage):
+            try:
+                hotels = json.loads(last.content)
+            except ValueError:
+                hotels = []
+            if isinstance(hotels, dict) and "columns" in hotels:
+                # search_hotels_multi returns a table: rebuild one dict per row
+                hotels = [dict(zip(hotels["columns"], row)) for row in hotels.get("rows", [])]
+            elif isinstance(hotels, dict):
+                hotels = hotels.get("hotels", [])
+            lines = [f"- {h['name']} ({h.get('price') or h.get('cheapest_night')}): {h.get('booking_link') or h.get('link')}"
+                     for h in hotels[:3] if isinstance(h, dict)]
+            message = AIMessage(content="Here are the top options:\n" + "\n".join(lines) if lines else "No hotels found.")
+        else:
+            message = AIMessage(content="Which city and which check-in and check-out dates?")
+
+        output_tokens = _count_tokens(message.content) + sum(_count_tokens(json.dumps(tc["args"])) for tc in message.tool_calls)
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens,
+        }
+        return message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+# --- SerpApi ---
+
+def fake_properties(query: str, count: int = 20) -> List[Dict[str, Any]]:
+    """Deterministic Google Hotels `properties` payload for a query."""
+    rng = random.Random(hashlib.md5(query.lower().encode()).hexdigest())
+    properties = []
+    for i in range(count):
+        price = rng.randint(6000, 60000)
+        properties.append({
+            "name": f"{query.title()} Hotel {i + 1}",
+            "description": "A deterministic benchmark hotel. " * 4,
+            "rate_per_night": {"lowest": f"¥{price:,}", "extracted_lowest": price},
+            "overall_rating": round(rng.uniform(3.0, 5.0), 1),
+            "reviews": rng.randint(10, 5000),
+            "link": f"https://example.com/hotels/{i + 1}",
+            "property_token": hashlib.md5(f"{query.lower()}:{i}".encode()).hexdigest()[:16],
+            "amenities": ["Free Wi-Fi", "Breakfast", "Air conditioning", "Pool"][: rng.randint(1, 4)],
+            "gps_coordinates": {"latitude": round(rng.uniform(33.0, 36.0), 6), "longitude": round(rng.uniform(130.0, 140.0), 6)},
+        })
+    return properties
+
+class FakeSerpApiServer:
+    """
+    Threaded local HTTP server for `/search?engine=google_hotels`.
+    Point HotelSearchTool at it with SERPAPI_BASE_URL=server.url.
+    """
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(server.latency)
+                params = parse_qs(urlparse(self.path).query)
+                query = params.get("q", [""])[0]
+                body = json.dumps({"search_metadata": {"status": "Success"}, "properties": fake_properties(query)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSerpApiServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+# --- Embeddings ---
+
+class HashEncoder:
+    """Hashes words into a fixed-size unit vector, so near-duplicate texts embed close together."""
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+# --- Redis ---
+
+class _FakeIndex:
+    def __init__(self, store: "FakeRedis", name: str):
+        self.store = store
+        self.name = name
+
+    def info(self):
+        if self.name not in self.store.indexes:
+            raise Exception("Unknown index name")
+        return {"index_name": self.name}
+
+    def create_index(self, fields, definition=None):
+        args = definition.args if definition else []
+        prefixes = [""]
+        if "PREFIX" in args:
+            i = args.index("PREFIX")
+            prefixes = args[i + 2:i + 2 + args[i + 1]]
+        self.store.indexes[self.name] = prefixes
+
+    def search(self, query, query_params=None):
+        k_match = re.search(r"KNN (\d+) @(\w+) \$(\w+) AS (\w+)", query.query_string())
+        top_k, field, param, score_name = int(k_match.group(1)), k_match.group(2), k_match.group(3), k_match.group(4)
+        filters = {
+            name: re.sub(r"\\(.)", r"\1", value).lower()
+            for name, value in re.findall(r"@(\w+):\{((?:\\.|[^}])*)\}", query.query_string())
+        }
+        vec = np.frombuffer(query_params[param], dtype=np.float32)
+
+        scored = []
+        for key, doc in self.store.live_hashes():
+            if not any(key.startswith(p) for p in self.store.indexes[self.name]):
+                continue
+            if any(doc.get(name, b"").decode().lower() != value for name, value in filters.items()):
+                continue
+            emb = np.frombuffer(doc[field], dtype=np.float32)
+            denom = float(np.linalg.norm(vec) * np.linalg.norm(emb)) or 1.0
+            scored.append((1.0 - float(np.dot(vec, emb)) / denom, key, doc))
+
+        scored.sort(key=lambda item: item[0])
+        docs = []
+        for score, key, doc in scored[:top_k]:
+            fields = {name: value.decode() for name, value in doc.items() if name != field}
+            docs.append(SimpleNamespace(id=key, **fields, **{score_name: str(score)}))
+        return SimpleNamespace(total=len(docs), docs=docs)
+
+class _FakePipeline:
+    def __init__(self, store: "FakeRedis"):
+        self.store = store
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.store, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+class FakeRedis:
+    """Thread-safe in-memory implementation of the redis-py calls RedisMemory makes."""
+    def __init__(self):
+        self.hashes: Dict[str, Dict[str, bytes]] = {}
+        self.sets: Dict[str, set] = {}
+        self.expiry: Dict[str, float] = {}
+        self.indexes: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def live_hashes(self):
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v) for k, v in self.hashes.items() if self.expiry.get(k, float("inf")) > now]
+
+    def ft(self, index_name: str) -> _FakeIndex:
+        return _FakeIndex(self, index_name)
+
+    def pipeline(self) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    def hset(self, key, mapping=None, **kwargs):
+        with self._lock:
+            self.hashes.setdefault(key, {}).update({k: self._encode(v) for k, v in (mapping or {}).items()})
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            doc = self.hashes.setdefault(key, {})
+            value = int(doc.get(field, b"0")) + amount
+            doc[field] = self._encode(value)
+            return value
+
+    def hgetall(self, key):
+        with self._lock:
+            return {k.encode(): v for k, v in self.hashes.get(key, {}).items()}
+
+    def expire(self, key, seconds):
+        with self._lock:
+            self.expiry[key] = time.monotonic() + seconds
+
+    def keys(self, pattern="*"):
+        return [k.encode() for k, _ in self.live_hashes() if fnmatch.fnmatch(k, pattern)]
+
+    def sadd(self, key, *values):
+        with self._lock:
+            self.sets.setdefault(key, set()).update(values)
+
+    def srem(self, key, *values):
+        with self._lock:
+            self.sets.get(key, set()).difference_update(values)
+
+    def sismember(self, key, value):
+        with self._lock:
+            return value in self.sets.get(key, set())
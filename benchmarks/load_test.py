@@ -0,0 +1,161 @@
+"""
+Load generator that replays multi-turn conversations against one shared
+ProfessionalHotelAgent graph (one MCP session, one memory) using the offline
+fakes for Gemini, SerpApi and Redis.
+
+Closed loop (fixed number of concurrent conversations):
+    python -m benchmarks.load_test --concurrency 16 --conversations 200
+
+Open loop (Poisson arrivals, conversations/s), capped in-flight:
+    python -m benchmarks.load_test --rate 20 --max-in-flight 64
+
+Saturation sweep over concurrency levels:
+    python -m benchmarks.load_test --sweep 1 2 4 8 16 32 64
+
+Recorded conversations (JSONL, see benchmarks/workloads.py):
+    python -m benchmarks.load_test --replay conversations.jsonl
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import build_offline_agent, start_offline_services, summarize
+from benchmarks.workloads import load_conversations, synthetic_conversations
+from src import instrumentation
+
+class LoadStats:
+    def __init__(self):
+        self.turn_ms: List[float] = []
+        self.node_ms: Dict[str, List[float]] = defaultdict(list)
+        self.queue_ms: List[float] = []
+        self.errors: Counter = Counter()
+        self.turns = 0
+
+    def report(self, elapsed: float) -> Dict:
+        failed = sum(self.errors.values())
+        return {
+            "turns": self.turns,
+            "errors": failed,
+            "error_rate": failed / self.turns if self.turns else 0.0,
+            "throughput_turns_per_s": (self.turns - failed) / elapsed if elapsed else 0.0,
+            "turn": summarize(self.turn_ms),
+            "queue": summarize(self.queue_ms),
+            "nodes": {node: summarize(samples) for node, samples in sorted(self.node_ms.items())},
+            "error_types": dict(self.errors),
+        }
+
+async def run_turn(app, history: list, text: str, user_id: str, stats: LoadStats) -> list:
+    """Streams one turn, attributing the time between node updates to the node that finished."""
+    messages = history + [HumanMessage(content=text)]
+    stats.turns += 1
+    start = last = time.perf_counter()
+    try:
+        async for update in app.astream({"messages": messages, "user_id": user_id}, stream_mode="updates"):
+            now = time.perf_counter()
+            for node, delta in update.items():
+                stats.node_ms[node].append((now - last) * 1000)
+                if delta and delta.get("messages"):
+                    messages = messages + delta["messages"]
+            last = now
+    except Exception as e:
+        stats.errors[type(e).__name__] += 1
+        return history
+    stats.turn_ms.append((time.perf_counter() - start) * 1000)
+    return messages
+
+async def run_conversation(app, conversation: List[str], user_id: str, stats: LoadStats,
+                           gate: asyncio.Semaphore, think_time: float, arrived: float):
+    async with gate:
+        stats.queue_ms.append((time.perf_counter() - arrived) * 1000)
+        history = []
+        for text in conversation:
+            history = await run_turn(app, history, text, user_id, stats)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+async def run_load(app, conversations: List[List[str]], concurrency: int, rate: Optional[float],
+                   think_time: float, seed: int = 7) -> Dict:
+    """Closed loop when `rate` is None, otherwise Poisson arrivals at `rate` conversations/s."""
+    stats = LoadStats()
+    gate = asyncio.Semaphore(concurrency)
+    rng = random.Random(seed)
+    tasks = []
+    start = time.perf_counter()
+    for i, conversation in enumerate(conversations):
+        if rate:
+            await asyncio.sleep(rng.expovariate(rate))
+        tasks.append(asyncio.create_task(
+            run_conversation(app, conversation, f"load-{i}", stats, gate, think_time, time.perf_counter())
+        ))
+    await asyncio.gather(*tasks)
+    return stats.report(time.perf_counter() - start)
+
+def print_report(label: str, report: Dict):
+    print(f"\n=== {label} ===")
+    print(f"turns {report['turns']}  errors {report['errors']} ({report['error_rate']:.1%})  "
+          f"throughput {report['throughput_turns_per_s']:.2f} turns/s")
+    if report["error_types"]:
+        print(f"error types: {report['error_types']}")
+    print(f"{'':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'count':>7}")
+    rows = [("turn", report["turn"]), ("queue", report["queue"])] + [(f"  {n}", s) for n, s in report["nodes"].items()]
+    for name, s in rows:
+        print(f"{name:<10} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['count']:>7}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replay", metavar="JSONL", help="Recorded conversations instead of synthetic ones")
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent conversations (closed loop)")
+    parser.add_argument("--rate", type=float, help="Conversation arrivals per second (open loop)")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="In-flight cap in open-loop mode")
+    parser.add_argument("--sweep", type=int, nargs="+", metavar="N", help="Run once per concurrency level")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between a reply and the next user turn")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--serp-latency", type=float, default=0.3)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the answer cache and prefetch")
+    parser.add_argument("--metrics-out", metavar="PATH", help="Enable instrumentation and write Prometheus metrics here")
+    args = parser.parse_args()
+
+    if args.metrics_out:
+        instrumentation.enable()
+
+    serp = start_offline_services(serp_latency=args.serp_latency)
+    conversations = (load_conversations(args.replay) if args.replay
+                     else synthetic_conversations(args.conversations, turns=args.turns))
+    features = False if args.no_cache else None
+
+    levels = args.sweep or [args.max_in_flight if args.rate else args.concurrency]
+    summary = []
+    try:
+        for level in levels:
+            # Fresh agent per level so caches don't carry over between runs
+            agent = build_offline_agent(llm_latency=args.llm_latency, prefetch=features, answer_cache=features)
+            app = await agent.build_graph()
+            report = await run_load(app, conversations, level, args.rate, args.think_time)
+            await agent.mcp_manager.disconnect()
+
+            label = f"rate {args.rate}/s, max in flight {level}" if args.rate else f"concurrency {level}"
+            print_report(label, report)
+            summary.append((level, report))
+    finally:
+        serp.stop()
+
+    if args.metrics_out:
+        with open(args.metrics_out, "w") as f:
+            f.write(instrumentation.render_prometheus())
+        print(f"\nMetrics written to {args.metrics_out}")
+
+    if len(summary) > 1:
+        print(f"\n{'level':>6} {'turns/s':>9} {'turn p95':>10} {'queue p95':>10} {'errors':>7}")
+        for level, report in summary:
+            print(f"{level:>6} {report['throughput_turns_per_s']:>9.2f} {report['turn']['p95_ms']:>10.1f} "
+                  f"{report['queue']['p95_ms']:>10.1f} {report['error_rate']:>7.1%}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,189 @@
+"""
+Offline benchmark suite. No API keys, Redis server or network access needed:
+the LLM, SerpApi and Redis are replaced by the deterministic fakes in
+benchmarks/fakes.py, while the agent graph, MCP bridge, MCP server and
+RedisMemory run unmodified.
+
+Usage:
+    python -m benchmarks.run_bench
+    python -m benchmarks.run_bench --save-baseline benchmarks/baselines/main.json
+    python -m benchmarks.run_bench --compare benchmarks/baselines/main.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import build_offline_agent, max_rss_mb, start_offline_services, summarize, turn_tokens
+from benchmarks.fakes import FakeRedis, HashEncoder
+from benchmarks.workloads import synthetic_conversations
+
+# Metrics where a larger value is an improvement; everything else should not grow
+HIGHER_IS_BETTER = ("throughput", "hit_rate")
+
+async def bench_graph(args) -> Dict[str, float]:
+    """Full turns through ProfessionalHotelAgent's compiled graph, one conversation at a time."""
+    agent = build_offline_agent(llm_latency=args.llm_latency)
+    app = await agent.build_graph()
+    conversations = synthetic_conversations(args.conversations, turns=args.turns)
+
+    samples, tokens = [], {"input_tokens": 0, "output_tokens": 0}
+    start = time.perf_counter()
+    for i, conversation in enumerate(conversations):
+        history = []
+        for text in conversation:
+            t0 = time.perf_counter()
+            result = await app.ainvoke({"messages": history + [HumanMessage(content=text)], "user_id": f"user-{i}"})
+            samples.append((time.perf_counter() - t0) * 1000)
+            for key, value in turn_tokens(result["messages"][len(history) + 1:]).items():
+                tokens[key] += value
+            history = result["messages"]
+    elapsed = time.perf_counter() - start
+    await agent.mcp_manager.disconnect()
+
+    stats = summarize(samples)
+    stats["throughput_turns_per_s"] = len(samples) / elapsed
+    stats["input_tokens_per_turn"] = tokens["input_tokens"] / len(samples)
+    stats["output_tokens_per_turn"] = tokens["output_tokens"] / len(samples)
+    stats["answer_cache_hit_rate"] = agent.memory.cache_stats()["hit_rate"]
+    return stats
+
+async def bench_mcp(args) -> Dict[str, float]:
+    """Per-call overhead of MCPClientManager.call_tool on a tool with no I/O."""
+    from src.mcp_bridge import MCPClientManager
+
+    manager = MCPClientManager(server_script_path="src/server.py")
+    await manager.connect()
+    call_args = {"hotel_name": "Grand Plaza Hotel", "check_in": "2030-01-01", "check_out": "2030-01-03"}
+    for _ in range(5):
+        await manager.call_tool("book_hotel", call_args)
+
+    samples = []
+    for _ in range(args.calls):
+        t0 = time.perf_counter()
+        await manager.call_tool("book_hotel", call_args)
+        samples.append((time.perf_counter() - t0) * 1000)
+    await manager.disconnect()
+    return summarize(samples)
+
+def bench_search(args, warm: bool) -> Dict[str, float]:
+    """HotelSearchTool against the fake SerpApi; cold = unique queries, warm = cache hits."""
+    from src.tools.search import HotelSearchTool
+
+    tool = HotelSearchTool()
+    queries = [f"City {i}" for i in range(args.searches)]
+    if warm:
+        for q in queries:
+            tool.search_hotels(q, "2030-01-01", "2030-01-03")
+    samples = []
+    for q in queries:
+        t0 = time.perf_counter()
+        tool.search_hotels(q, "2030-01-01", "2030-01-03")
+        samples.append((time.perf_counter() - t0) * 1000)
+    return summarize(samples)
+
+def bench_memory(args) -> Dict[str, float]:
+    """RedisMemory save/retrieve/answer-cache lookups on the in-memory vector store."""
+    from src.memory import RedisMemory
+
+    memory = RedisMemory(redis_client=FakeRedis(), encoder=HashEncoder())
+    for conversation in synthetic_conversations(args.memory_items, turns=1):
+        memory.save_interaction(conversation[0], "Here are the top options: ...")
+
+    samples = []
+    for conversation in synthetic_conversations(args.searches, turns=1, seed=11):
+        t0 = time.perf_counter()
+        memory.retrieve_context(conversation[0])
+        memory.lookup_answer(conversation[0], "en-US")
+        samples.append((time.perf_counter() - t0) * 1000)
+    return summarize(samples)
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> int:
+    """Prints per-metric deltas against a baseline and returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'scenario':<14} {'metric':<24} {'baseline':>11} {'current':>11} {'delta':>8}")
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get("results", {}).get(scenario, {}).get(metric)
+            # Single-sample extremes are too noisy to gate on
+            if base is None or metric in ("count", "max_ms"):
+                continue
+            delta = (value - base) / base if base else 0.0
+            worse = -delta if any(metric.startswith(m) or metric.endswith(m) for m in HIGHER_IS_BETTER) else delta
+            flag = ""
+            if worse > tolerance:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(f"{scenario:<14} {metric:<24} {base:>11.3f} {value:>11.3f} {delta:>+7.1%}{flag}")
+    return regressions
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--calls", type=int, default=200, help="MCP calls for the mcp scenario")
+    parser.add_argument("--searches", type=int, default=50)
+    parser.add_argument("--memory-items", type=int, default=500)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds of simulated LLM latency per call")
+    parser.add_argument("--serp-latency", type=float, default=0.05, help="Seconds of simulated SerpApi latency")
+    parser.add_argument("--scenarios", nargs="+", default=["graph", "mcp", "search_cold", "search_warm", "memory"])
+    parser.add_argument("--trace-memory", action="store_true", help="Report tracemalloc peaks (slows every scenario)")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression before failing")
+    args = parser.parse_args()
+
+    serp = start_offline_services(serp_latency=args.serp_latency)
+    runners = {
+        "graph": lambda: bench_graph(args),
+        "mcp": lambda: bench_mcp(args),
+        "search_cold": lambda: bench_search(args, warm=False),
+        "search_warm": lambda: bench_search(args, warm=True),
+        "memory": lambda: bench_memory(args),
+    }
+
+    results = {}
+    try:
+        for name in args.scenarios:
+            if args.trace_memory:
+                tracemalloc.start()
+            outcome = runners[name]()
+            stats = await outcome if asyncio.iscoroutine(outcome) else outcome
+            if args.trace_memory:
+                stats["tracemalloc_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            stats["max_rss_mb"] = max_rss_mb()
+            results[name] = stats
+    finally:
+        serp.stop()
+
+    for name, stats in results.items():
+        print(f"\n[{name}]")
+        for metric, value in stats.items():
+            print(f"  {metric:<24} {value:>12.3f}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or ".", exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "meta": {"python": platform.python_version(), "platform": platform.platform(), "args": vars(args)},
+                "results": results,
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{regressions} metric(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""Conversation workloads for the benchmarks: synthetic generators and JSONL recordings."""
+import json
+import random
+from datetime import date, timedelta
+from typing import List
+
+CITIES = ["Osaka", "Tokyo", "Kyoto", "Sapporo", "Fukuoka", "Nagoya", "Hiroshima", "Naha", "Kobe", "Yokohama"]
+TEMPLATES = [
+    "Find cheap hotels in {city} from {check_in} to {check_out}",
+    "I need a hotel in {city} from {check_in} to {check_out}",
+    "Any hotels in {city} with breakfast from {check_in} to {check_out}?",
+    # Multi-destination turn (search_hotels_multi)
+    "Compare hotels in {city} and {nearby} from {check_in} to {check_out}",
+]
+FOLLOW_UPS = [
+    "Which of those has the best rating?",
+    "Do any of them have a pool?",
+    "Thanks!",
+]
+
+def synthetic_conversations(count: int, turns: int = 2, repeat_ratio: float = 0.3, seed: int = 7) -> List[List[str]]:
+    """
+    Multi-turn conversations opening with a dated hotel search, followed by
+    chit-chat. About `repeat_ratio` of openings re-ask an earlier search with
+    different wording, which is what the answer and search caches target.
+    """
+    rng = random.Random(seed)
+    start = date(2030, 1, 1)
+    searches = []
+    conversations = []
+    for _ in range(count):
+        if searches and rng.random() < repeat_ratio:
+            city, check_in, check_out = rng.choice(searches)
+        else:
+            city = rng.choice(CITIES)
+            check_in = start + timedelta(days=rng.randint(0, 60))
+            check_out = check_in + timedelta(days=rng.randint(1, 4))
+            searches.append((city, check_in, check_out))
+        nearby = CITIES[(CITIES.index(city) + 1) % len(CITIES)]
+        opening = rng.choice(TEMPLATES).format(city=city, nearby=nearby, check_in=check_in, check_out=check_out)
+        conversations.append([opening] + rng.sample(FOLLOW_UPS, k=min(turns - 1, len(FOLLOW_UPS))))
+    return conversations
+
+def load_conversations(path: str) -> List[List[str]]:
+    """
+    Reads recorded conversations from JSONL: one object per line with a
+    `turns` list of user messages (a bare JSON list of strings also works).
+    """
+    conversations = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            conversations.append(record["turns"] if isinstance(record, dict) else record)
+    return conversations
@@ -0,0 +1,94 @@
+"""
+Microbenchmark of per-call MCP overhead for each MCPClientManager transport.
+
+Calls the side-effect free `book_hotel` tool so the numbers measure transport
+cost (framing, serialization, process hops) rather than SerpApi latency.
+
+Usage:
+    python scripts/bench_transports.py --calls 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(os.getcwd())
+# The server builds HotelSearchTool at import time; book_hotel never uses the key
+os.environ.setdefault("SERPAPI_KEY", "bench")
+
+from src.mcp_bridge import MCPClientManager
+
+ARGS = {"hotel_name": "Grand Plaza Hotel", "check_in": "2024-05-01", "check_out": "2024-05-05"}
+
+async def bench(transport: str, calls: int, url: str) -> dict:
+    manager = MCPClientManager("src/server.py", transport=transport, server_url=url)
+    start = time.perf_counter()
+    await manager.connect()
+    connect_ms = (time.perf_counter() - start) * 1000
+
+    # Warm up
+    for _ in range(5):
+        await manager.call_tool("book_hotel", ARGS)
+
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        await manager.call_tool("book_hotel", ARGS)
+        samples.append((time.perf_counter() - t0) * 1000)
+    await manager.disconnect()
+
+    samples.sort()
+    return {
+        "transport": transport,
+        "connect_ms": connect_ms,
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+async def wait_for_port(port: int, timeout: float = 20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"HTTP server did not start on port {port}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--transports", nargs="+", default=["stdio", "inprocess", "http"])
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}/mcp"
+    server = None
+    if "http" in args.transports:
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        server = subprocess.Popen(
+            [sys.executable, "src/server.py", "--transport", "http", "--host", "127.0.0.1", "--port", str(args.port)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        await wait_for_port(args.port)
+
+    results = []
+    try:
+        for transport in args.transports:
+            results.append(await bench(transport, args.calls, url))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(f"\n{'transport':<10} {'connect ms':>11} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for r in results:
+        print(f"{r['transport']:<10} {r['connect_ms']:>11.1f} {r['mean_ms']:>9.3f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,6 @@
 import os
 import asyncio
-import sys
-import json
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables first
@@ -9,174 +8,134 @@ load_dotenv()
 
 from google import genai
 from google.genai import types
-from src.memory import PreferenceMemory
-
-# MCP Client imports
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from google.genai.chats import AsyncChat
+from src.memory import RedisMemory
+from src.mcp_bridge import MCPClientManager
 
 class HotelAgent:
-    def __init__(self):
+    """
+    Lightweight MCP client on the async GenAI SDK.
+
+    One agent holds the MCP connection and the tool declarations; each
+    conversation gets its own chat from `new_session`, so many sessions can
+    run concurrently on the same event loop.
+    """
+    def __init__(self, mcp_manager: Optional[MCPClientManager] = None):
         self.api_key = os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY environment variable not set")
-        
+
         self.client = genai.Client(api_key=self.api_key)
-        self.memory = PreferenceMemory()
-        self.conversation_history = []
+        self.memory = RedisMemory()
+        self.mcp_manager = mcp_manager or MCPClientManager(server_script_path="src/server.py")
+        self._tools: Optional[List[types.Tool]] = None
 
-    async def run(self):
-        print("Welcome to the AI Hotel Booking Agent (MCP Client + GenAI SDK)!")
-        print("Type 'quit' to exit.")
+    async def get_tools(self) -> List[types.Tool]:
+        """Builds GenAI function declarations from the MCP tool schemas (once per agent)."""
+        if self._tools is None:
+            if not self.mcp_manager.session:
+                await self.mcp_manager.connect()
 
+            mcp_tools = await self.mcp_manager.session.list_tools()
+            self._tools = [
+                types.Tool(
+                    function_declarations=[
+                        types.FunctionDeclaration(
+                            name=tool.name,
+                            description=tool.description,
+                            parameters_json_schema=tool.inputSchema,
+                        )
+                        for tool in mcp_tools.tools
+                    ]
+                )
+            ]
+        return self._tools
 
-        # server parameters
-        # We assume src/server.py is executable via python
-        server_params = StdioServerParameters(
-            command=sys.executable,
-            args=["-m", "src.server"], # Run as module to fix imports
-            env=os.environ.copy()
+    async def new_session(self) -> AsyncChat:
+        """Starts an independent conversation sharing this agent's MCP connection."""
+        return self.client.aio.chats.create(
+            model="gemini-flash-latest",
+            config=types.GenerateContentConfig(
+                tools=await self.get_tools(),
+                temperature=0.7,
+                automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True)
+            )
         )
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                # Initialize session
-                await session.initialize()
-                
-                # List tools to build GenAI definitions
-                mcp_tools = await session.list_tools()
-                
-                # Convert MCP tools to GenAI tools
-                # This basic mapping handles the current tools. 
-                # For a generic implementation, a more robust mapper is needed.
-                genai_tools = []
-                for tool in mcp_tools.tools:
-                    # Generic Schema mapping (simplified for this task)
-                    # We accept the schema as is if it follows JSON schema
-                    
-                    # Convert MCP inputSchema to GenAI Schema
-                    # This is a bit complex as GenAI SDK has its own types.Schema
-                    # For now, we manually map known tools or try to convert.
-                    # Since we know the tools (search_hotels, book_hotel), we can keep the manual definitions 
-                    # OR we can try to dynamically build them.
-                    # Let's keep manual definitions for reliability in this specific task, 
-                    # but we use the session to CALL them.
-                    pass 
-
-                # Hardcoded tool definitions for GenAI (matching server.py)
-                # In a full dynamic system, we would convert `mcp_tools` to `types.Tool`.
-                # For this specific refactor, we keep definitions but change execution.
-                defined_tools = [
-                    types.Tool(
-                        function_declarations=[
-                            types.FunctionDeclaration(
-                                name="search_hotels",
-                                description="Searches for hotels using Google Hotels.",
-                                parameters=types.Schema(
-                                    type="OBJECT",
-                                    properties={
-                                        "query": types.Schema(type="STRING", description="Location or hotel name"),
-                                        "check_in": types.Schema(type="STRING", description="Check-in date (YYYY-MM-DD)"),
-                                        "check_out": types.Schema(type="STRING", description="Check-out date (YYYY-MM-DD)"),
-                                    },
-                                    required=["query"]
-                                )
-                            ),
-                            types.FunctionDeclaration(
-                                name="book_hotel",
-                                description="Generates a booking link for a hotel.",
-                                parameters=types.Schema(
-                                    type="OBJECT",
-                                    properties={
-                                        "hotel_name": types.Schema(type="STRING", description="Name of the hotel"),
-                                        "check_in": types.Schema(type="STRING", description="Check-in date (YYYY-MM-DD)"),
-                                        "check_out": types.Schema(type="STRING", description="Check-out date (YYYY-MM-DD)"),
-                                    },
-                                    required=["hotel_name", "check_in", "check_out"]
-                                )
-                            )
-                        ]
-                    )
-                ]
-
-                chat = self.client.chats.create(
-                    model="gemini-flash-latest",
-                    config=types.GenerateContentConfig(
-                        tools=defined_tools,
-                        temperature=0.7,
-                        automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True)
-                    )
-                )
+    async def _call_tool(self, fc: types.FunctionCall) -> types.Part:
+        print(f"Agent Calling Tool (via MCP): {fc.name} with {fc.args}")
+        try:
+            result_text = await self.mcp_manager.call_tool(fc.name, fc.args or {})
+            print(f"Tool Result: {result_text}")
+        except Exception as e:
+            result_text = f"Error: {str(e)}"
+            print(f"Tool Error: {e}")
+
+        return types.Part.from_function_response(name=fc.name, response={"result": result_text})
+
+    async def handle_turn(self, chat: AsyncChat, user_input: str) -> str:
+        """Runs one user turn (including tool calls) and returns the agent's reply."""
+        # 1. Retrieve Preferences (embedding + Redis search are blocking)
+        try:
+            preferences_context = await asyncio.to_thread(self.memory.retrieve_context, user_input)
+        except Exception:
+            preferences_context = "Memory unavailable."
+
+        # 2. Construct Prompt
+        prompt = f"""
+        User Input: {user_input}
+        User Preferences: {preferences_context}
+        Task: Help the user book a hotel. Verify availability first.
+        """
 
-                while True:
-                    # Use asyncio.to_thread for blocking input if needed, 
-                    # but raw input() is fine for simple CLI
-                    user_input = input("\nYou: ")
-                    if user_input.lower() in ['quit', 'exit']:
-                        break
-                    
-                    # 1. Retrieve Preferences
-                    try:
-                        relevant_prefs = self.memory.get_preferences(user_input)
-                        preferences_context = "\n".join(relevant_prefs) if relevant_prefs else "No specific preferences found."
-                    except Exception as e:
-                        preferences_context = "Memory unavailable."
-
-                    # 2. Construct Prompt
-                    prompt = f"""
-                    User Input: {user_input}
-                    User Preferences: {preferences_context}
-                    Task: Help the user book a hotel. Verify availability first.
-                    """
-                    
-                    try:
-                        # 3. Generate Response
-                        response = chat.send_message(prompt)
-                        
-                        # 4. Handle Tool Calls Loop
-                        while response.function_calls:
-                            for fc in response.function_calls:
-                                fn_name = fc.name
-                                fn_args = fc.args
-                                
-                                print(f"Agent Calling Tool (via MCP): {fn_name} with {fn_args}")
-                                
-                                try:
-                                    # Call tool via MCP Session
-                                    result_mcp = await session.call_tool(fn_name, arguments=fn_args)
-                                    # result_mcp.content is a list of TextContent or ImageContent
-                                    # We combine text content
-                                    result_text = ""
-                                    if result_mcp.content:
-                                        for content in result_mcp.content:
-                                            if content.type == 'text':
-                                                result_text += content.text
-                                    
-                                    print(f"Tool Result: {result_text}")
-                                    
-                                except Exception as e:
-                                    result_text = f"Error: {str(e)}"
-                                    print(f"Tool Error: {e}")
-                                
-                                # Send result back (GenAI expects simple dict or string)
-                                response = chat.send_message(
-                                    types.Part.from_function_response(
-                                        name=fn_name,
-                                        response={"result": result_text}
-                                    )
-                                )
-                        
-                        if response.text:
-                            print(f"Agent: {response.text}")
-                            
-                    except Exception as e:
-                        import traceback
-                        traceback.print_exc()
-                        print(f"Error: {e}")
+        # 3. Generate Response
+        response = await chat.send_message(prompt)
+
+        # 4. Handle Tool Calls Loop - independent calls in one step run concurrently
+        while response.function_calls:
+            parts = await asyncio.gather(*(self._call_tool(fc) for fc in response.function_calls))
+            response = await chat.send_message(list(parts))
+
+        return response.text or ""
+
+    async def run(self, max_turns: Optional[int] = None):
+        print("Welcome to the AI Hotel Booking Agent (MCP Client + GenAI SDK)!")
+        print("Type 'quit' to exit.")
+
+        chat = await self.new_session()
+        turns = 0
+        try:
+            while max_turns is None or turns < max_turns:
+                try:
+                    user_input = await asyncio.to_thread(input, "\nYou: ")
+                except EOFError:
+                    break
+                if user_input.lower() in ['quit', 'exit']:
+                    break
+                turns += 1
+
+                try:
+                    reply = await self.handle_turn(chat, user_input)
+                    if reply:
+                        print(f"Agent: {reply}")
+                except Exception as e:
+                    import traceback
+                    traceback.print_exc()
+                    print(f"Error: {e}")
+        finally:
+            await self.mcp_manager.disconnect()
 
 if __name__ == "__main__":
-    agent = HotelAgent()
-    try:
-        asyncio.run(agent.run())
-    except KeyboardInterrupt:
-        print("\nGoodbye!")
+    import argparse
+    from src.profiling import add_profile_args, maybe_profile
+
+    parser = argparse.ArgumentParser(description="Hotel booking agent (GenAI SDK + MCP)")
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    with maybe_profile(args, "agent", "src.agent"):
+        agent = HotelAgent()
+        try:
+            asyncio.run(agent.run(max_turns=args.profile_turns))
+        except KeyboardInterrupt:
+            print("\nGoodbye!")
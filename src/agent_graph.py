@@ -1,6 +1,7 @@
 import os
+import json
 import operator
-from typing import Annotated, TypedDict, List
+from typing import Annotated, TypedDict, List, Optional
 from dotenv import load_dotenv
 
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -10,23 +11,65 @@ from langgraph.prebuilt import ToolNode
 
 from src.memory import RedisMemory
 from src.mcp_bridge import MCPClientManager
+from src.prefetch import SearchPrefetcher
+from src.instrumentation import count, instrument_node, span, start_metrics_server
 
 load_dotenv()
 
+# Tools whose results come from a live hotel search
+SEARCH_TOOLS = {"search_hotels", "search_hotels_multi"}
+
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     context_str: str 
+    user_id: str
+
+def _message_text(msg: BaseMessage) -> str:
+    """Flattens AI message content (plain string or list of parts) into text."""
+    content = msg.content
+    if isinstance(content, list):
+        return "\n".join(part["text"] for part in content if isinstance(part, dict) and "text" in part)
+    return content
+
+def _search_fetched_at(msgs: List[BaseMessage]) -> Optional[float]:
+    """When the oldest search result among these tool messages was fetched, if known."""
+    times = []
+    for msg in msgs:
+        if not (isinstance(msg, ToolMessage) and msg.name in SEARCH_TOOLS):
+            continue
+        try:
+            result = json.loads(_message_text(msg))
+        except ValueError:
+            continue
+        if isinstance(result, dict):
+            times.append(result.get("fetched_at"))
+        elif isinstance(result, list):
+            times.extend(h.get("fetched_at") for h in result if isinstance(h, dict))
+    times = [t for t in times if t is not None]
+    return min(times) if times else None
 
 class ProfessionalHotelAgent:
-    def __init__(self):
-        self.memory = RedisMemory()
-        self.mcp_manager = MCPClientManager(server_script_path="src/server.py")
-        self.llm = ChatGoogleGenerativeAI(model="gemini-flash-latest", temperature=0)
+    def __init__(self, memory: Optional[RedisMemory] = None, mcp_manager: Optional[MCPClientManager] = None, llm=None):
+        self.memory = memory or RedisMemory()
+        self.mcp_manager = mcp_manager or MCPClientManager(server_script_path="src/server.py")
+        self.llm = llm or ChatGoogleGenerativeAI(model="gemini-flash-latest", temperature=0)
+        self.locale = os.getenv("HOTEL_LOCALE", "en-US")
+        self.use_answer_cache = os.getenv("SEMANTIC_CACHE", "1") == "1"
+        self.prefetcher = SearchPrefetcher(self.mcp_manager) if os.getenv("SPECULATIVE_PREFETCH", "1") == "1" else None
 
     async def build_graph(self):
         tools = await self.mcp_manager.get_langchain_tools()
         self.llm_with_tools = self.llm.bind_tools(tools)
         
+        def check_cache(state: AgentState):
+            last_msg = state["messages"][-1]
+            # Only questions naming a place and dates themselves are looked up (see RedisMemory._answer_scope)
+            if self.use_answer_cache and isinstance(last_msg, HumanMessage):
+                answer = self.memory.lookup_answer(last_msg.content, self.locale, state.get("user_id"))
+                if answer:
+                    return {"messages": [AIMessage(content=answer)]}
+            return {}
+
         def retrieve(state: AgentState):
             last_msg = state["messages"][-1]
             if isinstance(last_msg, HumanMessage):
@@ -38,13 +81,32 @@ class ProfessionalHotelAgent:
             context = state.get("context_str", "")
             system_prompt = (
                 "You are a Hotel Booking Agent. Always verify availability first using 'search_hotels'.\n"
-                "When you find hotels, ALWAYS providing the booking link or a 'View Details' link for the TOP 3 options immediately. "
-                "Do NOT ask 'Would you like me to generate a booking link?'. Just provide it.\n"
+                "To compare several cities or several possible check-in dates, make ONE 'search_hotels_multi' call "
+                "instead of many 'search_hotels' calls.\n"
+                "When you find hotels, ALWAYS provide the 'booking_link' from the search results for the TOP 3 options immediately. "
+                "The links already include the stay dates: do NOT call 'book_hotel' for hotels in the results, "
+                "and do NOT ask 'Would you like me to generate a booking link?'. Just provide it.\n"
+                "Use 'book_hotels' (one call for all of them) only when the user asks for links to hotels not in the results.\n"
                 "If the user request is vague, ask for Location, Check-in, and Check-out dates.\n"
                 f"CONTEXT:\n{context}"
             )
             messages = [SystemMessage(content=system_prompt)] + state["messages"]
-            response = await self.llm_with_tools.ainvoke(messages)
+
+            # First step of a turn: warm the search cache while the LLM thinks
+            last_msg = state["messages"][-1]
+            prefetch = None
+            if self.prefetcher and isinstance(last_msg, HumanMessage):
+                prefetch = self.prefetcher.maybe_prefetch(last_msg.content)
+
+            with span("llm_call", model="gemini"):
+                response = await self.llm_with_tools.ainvoke(messages)
+            usage = response.usage_metadata or {}
+            count("llm_tokens", usage.get("input_tokens", 0), direction="input")
+            count("llm_tokens", usage.get("output_tokens", 0), direction="output")
+
+            # Only this turn's prefetch; other conversations' searches keep running
+            if prefetch and not any(tc["name"] in SEARCH_TOOLS for tc in response.tool_calls):
+                prefetch.cancel()
             return {"messages": [response]}
 
         def save_memory(state: AgentState):
@@ -54,15 +116,39 @@ class ProfessionalHotelAgent:
                 last_human = msgs[-2]
                 if isinstance(last_human, HumanMessage) and isinstance(last_ai, AIMessage):
                     self.memory.save_interaction(last_human.content, last_ai.content)
+
+            # Cache final answers that were grounded in a fresh hotel search.
+            # The key is this turn's question alone, so follow-ups are skipped by cache_answer.
+            if self.use_answer_cache and isinstance(msgs[-1], AIMessage):
+                human_idx = max(i for i, m in enumerate(msgs) if isinstance(m, HumanMessage))
+                searched = any(
+                    isinstance(m, ToolMessage) and m.name in SEARCH_TOOLS
+                    for m in msgs[human_idx:]
+                )
+                answer = _message_text(msgs[-1])
+                if searched and answer:
+                    self.memory.cache_answer(
+                        msgs[human_idx].content, answer, self.locale, state.get("user_id"),
+                        fetched_at=_search_fetched_at(msgs[human_idx:]),
+                    )
             return {}
 
+        tool_node = ToolNode(tools)
+
+        async def run_tools(state: AgentState, config):
+            return await tool_node.ainvoke(state, config)
+
         workflow = StateGraph(AgentState)
-        workflow.add_node("retrieve", retrieve)
-        workflow.add_node("agent", chatbot)
-        workflow.add_node("tools", ToolNode(tools))
-        workflow.add_node("save", save_memory)
+        workflow.add_node("cache", instrument_node("cache", check_cache))
+        workflow.add_node("retrieve", instrument_node("retrieve", retrieve))
+        workflow.add_node("agent", instrument_node("agent", chatbot))
+        workflow.add_node("tools", instrument_node("tools", run_tools))
+        workflow.add_node("save", instrument_node("save", save_memory))
 
-        workflow.set_entry_point("retrieve")
+        workflow.set_entry_point("cache")
+        workflow.add_conditional_edges(
+            "cache", lambda state: END if isinstance(state["messages"][-1], AIMessage) else "retrieve"
+        )
         workflow.add_edge("retrieve", "agent")
         
         def should_continue(state):
@@ -74,30 +160,36 @@ class ProfessionalHotelAgent:
 
         return workflow.compile()
 
-    async def run_interactive(self):
+    async def run_interactive(self, max_turns: Optional[int] = None):
         print("🚀 Redis Agent Running...")
+        if os.getenv("AGENT_METRICS_PORT"):
+            start_metrics_server(int(os.getenv("AGENT_METRICS_PORT")))
         app = await self.build_graph()
-        while True:
-            user_input = input("\nUser: ")
+        user_id = os.getenv("USER_ID", "default")
+        turns = 0
+        while max_turns is None or turns < max_turns:
+            try:
+                user_input = input("\nUser: ")
+            except EOFError:
+                break
             if user_input.lower() in ["quit", "exit"]: break
-            inputs = {"messages": [HumanMessage(content=user_input)]}
+            turns += 1
+            inputs = {"messages": [HumanMessage(content=user_input)], "user_id": user_id}
             async for event in app.astream(inputs, stream_mode="values"):
                 msg = event["messages"][-1]
                 if msg.type == "ai" and msg.content:
-                    content = msg.content
-                    if isinstance(content, list):
-                        # Extract text from list content
-                        text_parts = []
-                        for part in content:
-                            if isinstance(part, dict) and "text" in part:
-                                text_parts.append(part["text"])
-                        text = "\n".join(text_parts)
-                        print(f"🤖 Agent: {text}")
-                    else:
-                        print(f"🤖 Agent: {content}")
+                    print(f"🤖 Agent: {_message_text(msg)}")
         await self.mcp_manager.disconnect()
 
 if __name__ == "__main__":
+    import argparse
     import asyncio
-    agent = ProfessionalHotelAgent()
-    asyncio.run(agent.run_interactive())
\ No newline at end of file
+    from src.profiling import add_profile_args, maybe_profile
+
+    parser = argparse.ArgumentParser(description="LangGraph hotel booking agent")
+    add_profile_args(parser)
+    args = parser.parse_args()
+
+    with maybe_profile(args, "agent_graph", "src.agent_graph"):
+        agent = ProfessionalHotelAgent()
+        asyncio.run(agent.run_interactive(max_turns=args.profile_turns))
\ No newline at end of file
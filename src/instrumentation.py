@@ -0,0 +1,197 @@
+"""
+Lightweight latency/counter instrumentation for the agent and the MCP server.
+
+Disabled by default; `span()` then returns a shared no-op object, so the cost
+at each call site is one global lookup. Enable with ``AGENT_METRICS=1`` and/or
+``AGENT_TRACE_LOG=<path>`` (one JSON line per finished span), or call
+`enable()` before the first turn.
+
+    with span("mcp_call_tool", tool="search_hotels"):
+        ...
+    count("cache_events", cache="search", result="hit")
+
+Metrics are exported in the Prometheus text format by `render_prometheus()`
+and `start_metrics_server(port)`.
+"""
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+PREFIX = "hotel_agent"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_enabled = False
+_trace_file = None
+_lock = threading.Lock()
+
+# (metric name, sorted label items) -> [bucket counts..., sum, count]
+_histograms: Dict[Tuple[str, tuple], list] = {}
+_counters: Dict[Tuple[str, tuple], float] = {}
+
+def enable(trace_log: Optional[str] = None):
+    """Turns instrumentation on, optionally appending span records to `trace_log`."""
+    global _enabled, _trace_file
+    _enabled = True
+    if trace_log and _trace_file is None:
+        _trace_file = open(trace_log, "a", buffering=1)
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def reset():
+    """Clears all recorded metrics (used between benchmark runs)."""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+def observe(name: str, seconds: float, labels: Dict[str, str]):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                series[i] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+def count(name: str, value: float = 1, **labels):
+    """Increments a counter (tokens, cache hits, ...)."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: Dict[str, str]):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        observe(self.name, duration, self.labels)
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            count(f"{self.name}_errors", **self.labels)
+        if _trace_file is not None:
+            record = {
+                "ts": time.time(),
+                "span": self.name,
+                "duration_ms": round(duration * 1000, 3),
+                "pid": os.getpid(),
+                "error": exc_type.__name__ if exc_type else None,
+                **self.labels,
+            }
+            with _lock:
+                _trace_file.write(json.dumps(record) + "\n")
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP = _NoopSpan()
+
+def span(name: str, **labels):
+    """Context manager timing the enclosed block into the `<name>_seconds` histogram."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, labels)
+
+def instrument_node(node: str, fn):
+    """Wraps a LangGraph node function (sync or async) in a `graph_node` span."""
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with span("graph_node", node=node):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span("graph_node", node=node):
+            return fn(*args, **kwargs)
+    return wrapper
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: tuple, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+def render_prometheus() -> str:
+    """Renders all metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+
+    typed = set()
+    for (name, labels), series in histograms:
+        metric = f"{PREFIX}_{name}_seconds"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} histogram")
+            typed.add(metric)
+        for bound, bucket in zip(BUCKETS, series):
+            lines.append(f"{metric}_bucket{_format_labels(labels, (('le', str(bound)),))} {bucket}")
+        lines.append(f"{metric}_bucket{_format_labels(labels, (('le', '+Inf'),))} {series[-1]}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {series[-2]}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {series[-1]}")
+
+    for (name, labels), value in counters:
+        metric = f"{PREFIX}_{name}_total"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serves `render_prometheus()` on http://host:port/metrics from a daemon thread."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+# Environment-driven activation, so both the agent and the MCP server subprocess pick it up
+if os.getenv("AGENT_METRICS", "0") == "1" or os.getenv("AGENT_TRACE_LOG"):
+    enable(os.getenv("AGENT_TRACE_LOG"))
@@ -0,0 +1,105 @@
+import re
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+NIGHTS = re.compile(r"\b(\d{1,2})\s+nights?\b", re.IGNORECASE)
+# "in Osaka", "near Shinjuku Station", "at Kyoto" - capitalised place names only
+LOCATION = re.compile(r"\b(?:in|at|near|around)\s+([A-Z][\w'.-]*(?:\s+[A-Z][\w'.-]*)*)")
+# Capitalised words after "in"/"at"/"and" that aren't places ("in March", "at Christmas", "and I")
+NOT_PLACES = {
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "christmas", "easter", "i",
+}
+# Further places listed after the first: "in Osaka, Kyoto and Nara"
+MORE_PLACES = re.compile(r"\s*(?:,|\s(?:and|or|vs\.?))\s+([A-Z][\w'.-]*(?:\s+[A-Z][\w'.-]*)*)")
+# Words that change which hotels a search returns, not just how the question is phrased
+QUALIFIERS = re.compile(
+    r"\b(cheap(?:est)?|budget|affordable|inexpensive|luxury|luxurious|upscale|boutique|"
+    r"(?:\d|three|four|five)[- ]star|hostels?|ryokans?|capsule|apartments?|family|pet[- ]friendly|"
+    r"breakfast|pool|spa|onsen|gym|parking|beach(?:front)?)\b",
+    re.IGNORECASE,
+)
+
+def _resolve_relative(text: str, today: date) -> Tuple[str, str]:
+    """Maps common relative phrases to (check_in, check_out)."""
+    lowered = text.lower()
+    if "weekend" in lowered:
+        # On Saturday or Sunday "this weekend" is the one already under way
+        friday = today + timedelta(days=4 - today.weekday())
+        if "next weekend" in lowered:
+            friday += timedelta(days=7)
+        check_in = max(friday, today)
+        check_out = max(friday + timedelta(days=2), check_in + timedelta(days=1))
+        return check_in.isoformat(), check_out.isoformat()
+    if "next week" in lowered:
+        monday = today + timedelta(days=7 - today.weekday())
+        return monday.isoformat(), ""
+    if "tomorrow" in lowered:
+        return (today + timedelta(days=1)).isoformat(), ""
+    if "tonight" in lowered or "today" in lowered:
+        return today.isoformat(), ""
+    return "", ""
+
+def extract_dates(text: str, today: Optional[date] = None) -> Tuple[str, str]:
+    """
+    Returns the (check_in, check_out) dates implied by the text, or empty strings.
+    Dates that don't exist (e.g. 2030-02-30) count as missing.
+    """
+    dates = ISO_DATE.findall(text)
+    if dates:
+        try:
+            for d in dates[:2]:
+                date.fromisoformat(d)
+        except ValueError:
+            return "", ""
+        check_in = dates[0]
+        check_out = dates[1] if len(dates) > 1 else ""
+    else:
+        check_in, check_out = _resolve_relative(text, today or date.today())
+
+    nights = NIGHTS.search(text)
+    if check_in and not check_out:
+        stay = int(nights.group(1)) if nights else 1
+        check_out = (date.fromisoformat(check_in) + timedelta(days=stay)).isoformat()
+    return check_in, check_out
+
+def _place(candidate: str) -> str:
+    words = candidate.strip(" .,").split()
+    while words and words[0].lower().strip(".,") in NOT_PLACES:
+        words.pop(0)
+    return " ".join(words)
+
+def extract_places(text: str) -> List[str]:
+    """All places the text names ("in Osaka and Kyoto" -> ["Osaka", "Kyoto"]), in order."""
+    places = []
+    for match in LOCATION.finditer(text):
+        place = _place(match.group(1))
+        if not place:
+            continue
+        places.append(place)
+        end = match.end()
+        while more := MORE_PLACES.match(text, end):
+            if _place(more.group(1)):
+                places.append(_place(more.group(1)))
+            end = more.end()
+    return list(dict.fromkeys(places))
+
+def extract_qualifiers(text: str) -> List[str]:
+    """Sorted result-changing qualifiers such as "cheap" or "breakfast"."""
+    return sorted({q.lower().replace(" ", "-") for q in QUALIFIERS.findall(text)})
+
+def extract_intent(text: str, today: Optional[date] = None) -> Optional[Dict[str, str]]:
+    """
+    Rule-based extraction of a hotel search from raw user input.
+    Returns `search_hotels` arguments for the first place named, or None if
+    no location was mentioned.
+    """
+    places = extract_places(text)
+    if not places:
+        return None
+    check_in, check_out = extract_dates(text, today)
+    return {"query": places[0], "check_in": check_in, "check_out": check_out}
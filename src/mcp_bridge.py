@@ -9,18 +9,65 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from pydantic import create_model, Field
 
+from src.instrumentation import span
+
+TRANSPORTS = ("stdio", "inprocess", "http")
+
+def _json_type(prop: Dict[str, Any]) -> Any:
+    """Maps a JSON schema property to a Python type for the pydantic args model."""
+    t = prop.get("type")
+    if t == "integer": return int
+    if t == "number": return float
+    if t == "boolean": return bool
+    # Keep the item type: Gemini rejects array parameters without `items`
+    if t == "array": return List[_json_type(prop.get("items", {}))]
+    if t == "object": return dict
+    return str
+
 class MCPClientManager:
     """
     Manages the lifecycle of the MCP Client connection and dynamically 
     converts MCP tools into LangChain/GenAI compatible tools.
+
+    Transports (``MCP_TRANSPORT``):
+        stdio     - spawn ``server_script_path`` as a subprocess (default).
+        inprocess - call the FastMCP ``mcp`` instance from ``src.server`` in this process.
+        http      - connect to a shared streamable-HTTP server at ``MCP_SERVER_URL``.
     """
-    def __init__(self, server_script_path: str):
+    def __init__(self, server_script_path: str, transport: Optional[str] = None, server_url: Optional[str] = None):
         self.server_script_path = server_script_path
+        self.transport = transport or os.getenv("MCP_TRANSPORT", "stdio")
+        self.server_url = server_url or os.getenv("MCP_SERVER_URL", "http://localhost:8000/mcp")
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Unknown MCP transport '{self.transport}', expected one of {TRANSPORTS}")
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
 
     async def connect(self):
-        """Establishes the stdio connection to the MCP server."""
+        """Establishes the connection to the MCP server over the configured transport."""
+        if self.transport == "stdio":
+            await self._connect_stdio()
+        else:
+            await self._connect_fastmcp()
+
+        await self.session.initialize()
+        print(f"✅ Connected to MCP Server ({self.transport})")
+
+    async def _connect_fastmcp(self):
+        """Opens an in-memory or streamable-HTTP session via FastMCP's client transports."""
+        if self.transport == "inprocess":
+            from fastmcp.client.transports import FastMCPTransport
+            # Imported lazily: loading the server pulls in the tool implementations
+            from src.server import mcp
+            transport = FastMCPTransport(mcp)
+        else:
+            from fastmcp.client.transports import StreamableHttpTransport
+            transport = StreamableHttpTransport(self.server_url)
+
+        self.session = await self.exit_stack.enter_async_context(transport.connect_session())
+
+    async def _connect_stdio(self):
+        """Spawns the MCP server as a subprocess and connects over stdio."""
         # 1. Setup Environment
         # Get the absolute path to the 'src' directory
         server_dir = os.path.dirname(os.path.abspath(self.server_script_path))
@@ -48,9 +95,6 @@ class MCPClientManager:
         self.session = await self.exit_stack.enter_async_context(
             ClientSession(read, write)
         )
-        
-        await self.session.initialize()
-        print(f"✅ Connected to MCP Server")
 
     async def disconnect(self):
         """Clean shutdown."""
@@ -61,6 +105,16 @@ class MCPClientManager:
             pass
         print("🛑 Disconnected from MCP Server")
 
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Calls an MCP tool and returns its combined text content."""
+        if not self.session:
+            raise RuntimeError("MCP Session disconnected")
+
+        with span("mcp_call_tool", tool=tool_name, transport=self.transport):
+            result = await self.session.call_tool(tool_name, arguments=arguments)
+        text_content = [c.text for c in result.content if c.type == 'text']
+        return "\n".join(text_content)
+
     async def get_langchain_tools(self) -> List[StructuredTool]:
         """
         Dynamically fetches MCP tools and converts them to LangChain StructuredTools.
@@ -79,13 +133,10 @@ class MCPClientManager:
             
             fields = {}
             for name, prop in properties.items():
-                py_type = str 
-                t = prop.get("type")
-                if t == "integer": py_type = int
-                elif t == "number": py_type = float
-                elif t == "boolean": py_type = bool
-                elif t == "array": py_type = list
-                elif t == "object": py_type = dict
+                # Optional[...] parameters arrive as anyOf [<schema>, null]
+                if "anyOf" in prop:
+                    prop = {**next((p for p in prop["anyOf"] if p.get("type") != "null"), {}), **prop}
+                py_type = _json_type(prop)
                 
                 desc = prop.get("description", "")
                 
@@ -99,12 +150,9 @@ class MCPClientManager:
 
             # --- 2. Define Execution Logic ---
             async def _executor(tool_name=mcp_tool.name, **kwargs):
-                if not self.session:
-                    raise RuntimeError("MCP Session disconnected")
-                
-                result = await self.session.call_tool(tool_name, arguments=kwargs)
-                text_content = [c.text for c in result.content if c.type == 'text']
-                return "\n".join(text_content)
+                # Omitted optional args arrive as None; let the server apply its defaults
+                arguments = {k: v for k, v in kwargs.items() if v is not None}
+                return await self.call_tool(tool_name, arguments)
 
             # --- 3. Create LangChain Tool ---
             tool = StructuredTool.from_function(
@@ -1,27 +1,60 @@
 import os
+import re
+import time
 import uuid
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
+
 import numpy as np
 import redis
 from redis.commands.search.index_definition import IndexDefinition, IndexType
 from redis.commands.search.query import Query
-from redis.commands.search.field import TextField, VectorField
-from sentence_transformers import SentenceTransformer
+from redis.commands.search.field import TagField, TextField, VectorField
+
+from src.intent import extract_dates, extract_places, extract_qualifiers
+from src.instrumentation import count, span
+
+def _tag(value: str) -> str:
+    """Escapes a value for use inside a RediSearch TAG filter."""
+    return re.sub(r"([^A-Za-z0-9_])", r"\\\1", value or "none")
 
 class RedisMemory:
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
-        self.redis_client = redis.from_url(redis_url)
-        self.encoder = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, redis_url: str = "redis://localhost:6379", redis_client=None, encoder=None):
+        # Client and encoder can be injected (e.g. the offline fakes in benchmarks/)
+        self.redis_client = redis_client or redis.from_url(redis_url)
+        if encoder is None:
+            # Deferred: importing sentence_transformers pulls in torch
+            from sentence_transformers import SentenceTransformer
+            encoder = SentenceTransformer("all-MiniLM-L6-v2")
+        self.encoder = encoder
         self.vector_dim = 384  # Dimension for all-MiniLM-L6-v2
+        # The same user text is embedded by the cache lookup, retrieval and save steps of a turn
+        self._get_embedding = lru_cache(maxsize=256)(self._get_embedding)
 
         # Define Index Names
         self.pref_index = "idx:preferences"
         self.history_index = "idx:interactions"
+        self.answer_index = "idx:answers"
+
+        # Semantic answer cache settings.
+        # Cached answers quote live prices, so they expire when the oldest search they quote does.
+        self.cache_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+        self.cache_ttl = int(os.getenv("SEARCH_FRESHNESS_TTL", "900"))
+        self.cache_stats_key = "answer_cache:stats"
+        self.cache_opt_out_key = "answer_cache:opt_out"
 
         # Initialize Indices
         self._create_index(self.pref_index, "preference:")
         self._create_index(self.history_index, "interaction:")
+        self._create_index(
+            self.answer_index, "answer:",
+            extra_fields=(
+                TagField("place"), TagField("qualifiers"),
+                TagField("check_in"), TagField("check_out"), TagField("locale"),
+            ),
+        )
 
-    def _create_index(self, index_name, prefix):
+    def _create_index(self, index_name, prefix, extra_fields=()):
         """Creates a Redis Vector Search Index if it doesn't exist."""
         try:
             self.redis_client.ft(index_name).info()
@@ -30,6 +63,7 @@ class RedisMemory:
             print(f"Creating index {index_name}...")
             schema = (
                 TextField("content"),
+                *extra_fields,
                 VectorField(
                     "embedding",
                     "FLAT", # Use HNSW for production with millions of items
@@ -45,26 +79,31 @@ class RedisMemory:
 
     def _get_embedding(self, text: str) -> bytes:
         """Generates vector embedding."""
-        vector = self.encoder.encode(text).astype(np.float32).tobytes()
+        with span("embedding"):
+            vector = self.encoder.encode(text).astype(np.float32).tobytes()
         return vector
 
     def add_preference(self, text: str):
         """Stores a static user preference."""
         key = f"preference:{uuid.uuid4()}"
-        self.redis_client.hset(key, mapping={
-            "content": text,
-            "embedding": self._get_embedding(text)
-        })
+        embedding = self._get_embedding(text)
+        with span("redis_query", op="add_preference"):
+            self.redis_client.hset(key, mapping={
+                "content": text,
+                "embedding": embedding
+            })
 
     def save_interaction(self, user_query: str, agent_response: str):
         """Stores a conversation turn for RAG."""
         # We embed the user query to find it later when they ask similar things
         text = f"User asked: {user_query} | Agent answered: {agent_response}"
         key = f"interaction:{uuid.uuid4()}"
-        self.redis_client.hset(key, mapping={
-            "content": text,
-            "embedding": self._get_embedding(user_query) # Embed query for relevance search
-        })
+        embedding = self._get_embedding(user_query) # Embed query for relevance search
+        with span("redis_query", op="save_interaction"):
+            self.redis_client.hset(key, mapping={
+                "content": text,
+                "embedding": embedding
+            })
 
     def retrieve_context(self, query: str, top_k: int = 3) -> str:
         """Searches BOTH Preferences and History for relevant context."""
@@ -73,7 +112,8 @@ class RedisMemory:
         # Helper to search an index
         def search_index(index_name):
             q = Query(f"*=>[KNN {top_k} @embedding $vec AS score]").return_fields("content", "score").dialect(2)
-            res = self.redis_client.ft(index_name).search(q, query_params={"vec": query_vector})
+            with span("redis_query", op="knn", index=index_name):
+                res = self.redis_client.ft(index_name).search(q, query_params={"vec": query_vector})
             return [doc.content for doc in res.docs]
 
         # Fetch from both
@@ -86,4 +126,114 @@ class RedisMemory:
         if history:
             context_parts.append("RELEVANT PAST INTERACTIONS:\n" + "\n".join(f"- {h}" for h in history))
             
-        return "\n\n".join(context_parts) if context_parts else "No relevant history found."
\ No newline at end of file
+        return "\n\n".join(context_parts) if context_parts else "No relevant history found."
+
+    # --- Semantic Answer Cache ---
+
+    def set_cache_opt_out(self, user_id: str, opt_out: bool = True):
+        """Excludes (or re-includes) a user from answer caching."""
+        if opt_out:
+            self.redis_client.sadd(self.cache_opt_out_key, user_id)
+        else:
+            self.redis_client.srem(self.cache_opt_out_key, user_id)
+
+    def is_cache_opted_out(self, user_id: Optional[str]) -> bool:
+        if not user_id:
+            return False
+        return bool(self.redis_client.sismember(self.cache_opt_out_key, user_id))
+
+    @staticmethod
+    def _answer_scope(query: str) -> Optional[Tuple[str, str, str, str]]:
+        """
+        (place, qualifiers, check_in, check_out) of a self-contained hotel question, or None.
+        Follow-ups like "which has a pool?" depend on earlier turns, and comparisons
+        of several places are too varied to reuse, so neither is cached.
+        """
+        places = extract_places(query)
+        check_in, check_out = extract_dates(query)
+        if len(places) != 1 or not check_in:
+            return None
+        qualifiers = " ".join(extract_qualifiers(query)) or "none"
+        return " ".join(places[0].lower().split()), qualifiers, check_in, check_out
+
+    def lookup_answer(self, query: str, locale: str, user_id: Optional[str] = None) -> Optional[str]:
+        """
+        Returns a cached final answer for a near-duplicate question about the
+        same place, qualifiers, dates and locale, or None on a miss.
+        """
+        if self.is_cache_opted_out(user_id):
+            return None
+        scope = self._answer_scope(query)
+        if scope is None:
+            count("cache_events", cache="answer", result="skipped")
+            return None
+
+        place, qualifiers, check_in, check_out = scope
+        filters = (
+            f"(@place:{{{_tag(place)}}} @qualifiers:{{{_tag(qualifiers)}}} "
+            f"@check_in:{{{_tag(check_in)}}} @check_out:{{{_tag(check_out)}}} @locale:{{{_tag(locale)}}})"
+        )
+        q = (
+            Query(f"{filters}=>[KNN 1 @embedding $vec AS score]")
+            .sort_by("score")
+            .return_fields("answer", "score")
+            .dialect(2)
+        )
+        query_vector = self._get_embedding(query)
+        with span("redis_query", op="knn", index=self.answer_index):
+            res = self.redis_client.ft(self.answer_index).search(
+                q, query_params={"vec": query_vector}
+            )
+
+        # COSINE distance -> similarity
+        if res.docs and 1 - float(res.docs[0].score) >= self.cache_threshold:
+            self.redis_client.hincrby(self.cache_stats_key, "hits", 1)
+            count("cache_events", cache="answer", result="hit")
+            return res.docs[0].answer
+
+        self.redis_client.hincrby(self.cache_stats_key, "misses", 1)
+        count("cache_events", cache="answer", result="miss")
+        return None
+
+    def cache_answer(
+        self, query: str, answer: str, locale: str, user_id: Optional[str] = None, fetched_at: Optional[float] = None
+    ):
+        """
+        Stores a final answer, expiring together with the search results it quotes.
+        `fetched_at` is when the oldest of those results was fetched from SerpApi
+        (they may have been served from the search cache); defaults to now.
+        """
+        ttl = self.cache_ttl
+        if fetched_at is not None:
+            ttl = int(self.cache_ttl - max(0.0, time.time() - fetched_at))
+        if ttl <= 0 or self.is_cache_opted_out(user_id):
+            return
+        scope = self._answer_scope(query)
+        if scope is None:
+            return
+
+        place, qualifiers, check_in, check_out = scope
+        key = f"answer:{uuid.uuid4()}"
+        embedding = self._get_embedding(query)
+        pipe = self.redis_client.pipeline()
+        pipe.hset(key, mapping={
+            "content": query,
+            "answer": answer,
+            "place": place,
+            "qualifiers": qualifiers,
+            "check_in": check_in,
+            "check_out": check_out,
+            "locale": locale or "none",
+            "embedding": embedding,
+        })
+        pipe.expire(key, ttl)
+        with span("redis_query", op="cache_answer"):
+            pipe.execute()
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters and hit rate of the answer cache."""
+        raw = self.redis_client.hgetall(self.cache_stats_key)
+        hits = int(raw.get(b"hits", 0))
+        misses = int(raw.get(b"misses", 0))
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
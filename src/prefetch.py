@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import date
+from typing import Dict, Optional, Set
+
+from src.intent import extract_intent, extract_qualifiers
+from src.mcp_bridge import MCPClientManager
+from src.instrumentation import count
+
+logger = logging.getLogger("hotel-agent")
+
+class SearchPrefetcher:
+    """
+    Speculatively runs `search_hotels` on the MCP server while the LLM is still
+    deciding what to do, so its eventual tool call hits the server's warm cache.
+
+    Prefetches are budgeted (at most `budget` per `window` seconds). The caller
+    owns the task returned by `maybe_prefetch` and cancels it when its turn
+    ends without a search. Cancelling only stops waiting for the reply: the
+    server keeps running the SerpApi request in its worker thread (and caches
+    the result), so a cancelled prefetch still costs its SerpApi quota.
+    """
+    def __init__(self, mcp_manager: MCPClientManager, budget: Optional[int] = None, window: float = 3600):
+        self.mcp_manager = mcp_manager
+        self.budget = budget if budget is not None else int(os.getenv("PREFETCH_BUDGET", "30"))
+        self.window = window
+        # Searches repeated within this window are already cached on the server
+        self.freshness_ttl = int(os.getenv("SEARCH_FRESHNESS_TTL", "900"))
+        self._spent = deque()  # monotonic timestamps of issued prefetches
+        self._recent: Dict[tuple, float] = {}
+        self._tasks: Set[asyncio.Task] = set()  # strong references to running prefetches
+
+    def _take_budget(self) -> bool:
+        now = time.monotonic()
+        while self._spent and now - self._spent[0] > self.window:
+            self._spent.popleft()
+        if len(self._spent) >= self.budget:
+            return False
+        self._spent.append(now)
+        return True
+
+    def maybe_prefetch(self, user_input: str) -> Optional[asyncio.Task]:
+        """
+        Starts a background search if the input names a place and a future check-in date.
+        Returns the prefetch task, or None when nothing was started.
+        """
+        intent = extract_intent(user_input)
+        # Without dates the agent asks a follow-up question instead of searching
+        if not intent or not intent["check_in"]:
+            return None
+        # SerpApi rejects past stays; don't spend budget on them
+        if date.fromisoformat(intent["check_in"]) < date.today():
+            count("prefetch_events", result="past_dates")
+            return None
+        # The LLM keeps qualifiers in its query ("cheap hotels in Osaka"), which is a
+        # different search cache entry than the bare place we could prefetch
+        if extract_qualifiers(user_input):
+            count("prefetch_events", result="qualified")
+            return None
+
+        key = (intent["query"].lower(), intent["check_in"], intent["check_out"])
+        now = time.monotonic()
+        self._recent = {k: t for k, t in self._recent.items() if now - t < self.freshness_ttl}
+        if key in self._recent:
+            count("prefetch_events", result="duplicate")
+            return None
+        if not self._take_budget():
+            count("prefetch_events", result="over_budget")
+            return None
+        self._recent[key] = now
+        count("prefetch_events", result="issued")
+
+        task = asyncio.create_task(self._run(key, intent))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, key: tuple, intent: Dict[str, str]):
+        try:
+            await self.mcp_manager.call_tool("search_hotels", intent)
+        except asyncio.CancelledError:
+            # Allow a retry: it joins the server's in-flight request or hits its cache
+            self._recent.pop(key, None)
+            count("prefetch_events", result="cancelled")
+            raise
+        except Exception as e:
+            # Speculative work must never surface errors to the conversation
+            count("prefetch_events", result="failed")
+            logger.debug(f"Prefetch failed for {intent}: {e}")
@@ -0,0 +1,134 @@
+"""
+Opt-in profiling for the agent and MCP server entry points (``--profile``).
+
+Two modes:
+    sampling      - a background thread samples every thread's stack and
+                    writes collapsed stacks (``.folded``) for flamegraph.pl,
+                    speedscope or inferno.
+    deterministic - cProfile on the main thread, written as ``.pstats``
+                    (snakeviz, flameprof, ``python -m pstats``).
+
+Each profiled process also writes an import-time breakdown of its entry
+module. When the agent is profiled it sets ``AGENT_PROFILE_DIR`` so a stdio
+MCP server subprocess profiles itself into the same directory.
+"""
+import argparse
+import cProfile
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+class SamplingProfiler:
+    """Samples all Python thread stacks every `interval` seconds."""
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, "thread"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: str):
+        with open(path, "w") as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+def import_time_breakdown(module: str, path: str, top: int = 40):
+    """Imports `module` in a fresh interpreter with -X importtime and writes the slowest imports."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=dict(os.environ, AGENT_PROFILE_DIR=""),
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (.*)", line)
+        if match:
+            rows.append((int(match.group(2)), int(match.group(1)), match.group(3)))
+
+    rows.sort(reverse=True)
+    with open(path, "w") as f:
+        f.write(f"Import time for `{module}` (microseconds)\n")
+        f.write(f"{'cumulative':>12} {'self':>10}  package\n")
+        for cumulative, own, name in rows[:top]:
+            f.write(f"{cumulative:>12} {own:>10}  {name}\n")
+
+@contextmanager
+def profile_session(name: str, out_dir: str, mode: str = "sampling", module: Optional[str] = None):
+    """Profiles the enclosed block and writes `<name>-<pid>.*` files into `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{name}-{os.getpid()}")
+    if module:
+        import_time_breakdown(module, f"{base}-imports.txt")
+
+    # Children (the stdio MCP server) profile themselves into the same place
+    os.environ["AGENT_PROFILE_DIR"] = out_dir
+    os.environ["AGENT_PROFILE_MODE"] = mode
+
+    # Make SIGTERM (how the stdio client stops the server) unwind through `finally`
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    if mode == "deterministic":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = SamplingProfiler()
+        profiler.start()
+    try:
+        yield
+    finally:
+        if mode == "deterministic":
+            profiler.disable()
+            profiler.dump_stats(f"{base}.pstats")
+            print(f"📈 Profile written to {base}.pstats", file=sys.stderr)
+        else:
+            profiler.stop()
+            profiler.write_folded(f"{base}.folded")
+            print(f"📈 Profile written to {base}.folded", file=sys.stderr)
+
+def add_profile_args(parser: argparse.ArgumentParser, turns: bool = True):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", action="store_true", help="Profile this run")
+    group.add_argument("--profile-dir", default=os.getenv("AGENT_PROFILE_DIR") or "profiles")
+    group.add_argument("--profile-mode", choices=["sampling", "deterministic"],
+                       default=os.getenv("AGENT_PROFILE_MODE") or "sampling")
+    if turns:
+        group.add_argument("--profile-turns", type=int, default=None, metavar="N",
+                           help="Exit after N user turns (e.g. with questions piped on stdin)")
+
+@contextmanager
+def maybe_profile(args: argparse.Namespace, name: str, module: str):
+    """`profile_session` when --profile was given (or inherited via AGENT_PROFILE_DIR), else a no-op."""
+    if args.profile or os.getenv("AGENT_PROFILE_DIR"):
+        with profile_session(name, args.profile_dir, args.profile_mode, module):
+            yield
+    else:
+        yield
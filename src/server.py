@@ -1,10 +1,14 @@
+import argparse
 from fastmcp import FastMCP
 from src.tools.search import HotelSearchTool
 from src.tools.booking import BookingTool
+from src.instrumentation import start_metrics_server
+from src.profiling import add_profile_args, maybe_profile
 import json
 import logging
+import os
 from dotenv import load_dotenv
-from typing import Optional
+from typing import List, Optional
 
 load_dotenv()
 
@@ -38,6 +42,34 @@ def search_hotels(query: str, check_in: str = "", check_out: str = "") -> str:
         logger.error(f"Error searching hotels: {e}")
         return json.dumps({"error": str(e)})
 
+@mcp.tool()
+def search_hotels_multi(
+    queries: List[str],
+    check_in: str = "",
+    check_out: str = "",
+    check_in_dates: Optional[List[str]] = None,
+    nights: int = 1,
+    limit: int = 15,
+) -> str:
+    """
+    Compares several destinations and/or flexible check-in dates in ONE call.
+    Returns a single table ranked by price, one row per hotel with its cheapest night.
+    
+    Args:
+        queries: Locations or hotel names to compare.
+        check_in: Check-in date (YYYY-MM-DD) when the dates are fixed.
+        check_out: Check-out date (YYYY-MM-DD) when the dates are fixed.
+        check_in_dates: Candidate check-in dates (YYYY-MM-DD) for flexible-date searches.
+        nights: Number of nights (at least 1) per stay when using check_in_dates.
+        limit: Maximum number of rows to return.
+    """
+    try:
+        results = search_tool.search_many(queries, check_in, check_out, check_in_dates, nights, limit)
+        return json.dumps(results)
+    except Exception as e:
+        logger.error(f"Error searching hotels: {e}")
+        return json.dumps({"error": str(e)})
+
 @mcp.tool()
 def book_hotel(hotel_name: str, check_in: str, check_out: str) -> str:
     """
@@ -54,5 +86,41 @@ def book_hotel(hotel_name: str, check_in: str, check_out: str) -> str:
         logger.error(f"Error generating booking link: {e}")
         return f"Error: {str(e)}"
 
+@mcp.tool()
+def book_hotels(hotel_names: List[str], check_in: str, check_out: str) -> str:
+    """
+    Generates booking links for several hotels at once.
+    Only needed for hotels that are NOT in the latest search results
+    (search results already include a dated 'booking_link').
+    
+    Args:
+        hotel_names: Names of the hotels.
+        check_in: Check-in date (YYYY-MM-DD).
+        check_out: Check-out date (YYYY-MM-DD).
+    """
+    try:
+        return json.dumps(booking_tool.generate_booking_links(hotel_names, check_in, check_out))
+    except Exception as e:
+        logger.error(f"Error generating booking links: {e}")
+        return json.dumps({"error": str(e)})
+
 if __name__ == "__main__":
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Hotel Agent MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio",
+                        help="stdio for a per-agent subprocess, http for a shared streamable-HTTP server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("MCP_METRICS_PORT", "0")),
+                        help="Serve Prometheus metrics on this port (needs AGENT_METRICS=1)")
+    add_profile_args(parser, turns=False)
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    # A stdio server spawned by a profiled agent inherits AGENT_PROFILE_DIR
+    with maybe_profile(args, "server", "src.server"):
+        if args.transport == "http":
+            mcp.run(transport="http", host=args.host, port=args.port)
+        else:
+            mcp.run()
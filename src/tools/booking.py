@@ -1,22 +1,33 @@
 import urllib.parse
+from typing import Dict, List
 
 class BookingTool:
+    base_url = "https://www.google.com/travel/hotels"
+
     def generate_booking_link(self, hotel_name: str, check_in: str, check_out: str) -> str:
         """
         Generates a direct booking link (Mock or Deep Link).
         Since we can't scrape the dynamic booking token easily without a session,
         we will generate a Google Hotel Search deep link for that specific hotel and output it.
         """
-        base_url = "https://www.google.com/travel/hotels"
         query_params = {
             "q": hotel_name,
             "dpr": 1
         }
+        # Encode the stay so the page opens on the requested dates
+        if check_in:
+            query_params["checkin"] = check_in
+        if check_out:
+            query_params["checkout"] = check_out
         # Note: True deep linking to the checkout page is complex and often requires affiliate tokens.
         # We will point the user to the specific hotel's date selection page on Google Travel.
-        
+
         encoded_query = urllib.parse.urlencode(query_params)
-        return f"{base_url}?{encoded_query}"
+        return f"{self.base_url}?{encoded_query}"
+
+    def generate_booking_links(self, hotel_names: List[str], check_in: str, check_out: str) -> Dict[str, str]:
+        """Generates deep links for several hotels sharing the same stay dates."""
+        return {name: self.generate_booking_link(name, check_in, check_out) for name in hotel_names}
 
 if __name__ == "__main__":
     tool = BookingTool()
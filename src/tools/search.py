@@ -1,8 +1,22 @@
+import logging
 import os
-import sys
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
 from serpapi import GoogleSearch
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.instrumentation import count, span
+from src.tools.booking import BookingTool
+
+logger = logging.getLogger("hotel-search")
+
+# Phrases the LLM (or the user) wraps around the location that don't change the results.
+# Qualifiers such as "cheap" or "luxury" do change them, so they stay in the key.
+QUERY_NOISE = re.compile(r"^(?:hotels?|places to stay|accommodations?)\s+(?:in|near|at)\s+")
 
 class HotelSearchTool:
     def __init__(self):
@@ -10,15 +24,84 @@ class HotelSearchTool:
         if not self.api_key:
             raise ValueError("SERPAPI_KEY environment variable not set")
 
+        # Results cache shared by LLM tool calls and speculative prefetches.
+        # Keyed on the normalised query so "Osaka" and "hotels in Osaka" share an entry.
+        self.cache_ttl = int(os.getenv("SEARCH_FRESHNESS_TTL", "900"))
+        self._cache: Dict[Tuple[str, str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._in_flight: Dict[Tuple[str, str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.booking_tool = BookingTool()
+        # Fan-out limits for search_many (SerpApi quota and rate limits)
+        self.max_concurrency = int(os.getenv("SEARCH_CONCURRENCY", "4"))
+        self.max_fanout = int(os.getenv("SEARCH_MAX_FANOUT", "20"))
+        # Point at a stand-in SerpApi (e.g. benchmarks/fakes.py) instead of serpapi.com
+        self.base_url = os.getenv("SERPAPI_BASE_URL")
+
+    @staticmethod
+    def _property_key(hotel: Dict[str, Any]) -> str:
+        """Identity of a property across searches: SerpApi's token, its location, or its name."""
+        if hotel.get("property_token"):
+            return f"token:{hotel['property_token']}"
+        gps = hotel.get("gps_coordinates") or {}
+        if gps.get("latitude") is not None and gps.get("longitude") is not None:
+            return f"gps:{gps['latitude']:.5f},{gps['longitude']:.5f}"
+        return "name:" + " ".join(hotel["name"].lower().split())
+
+    @staticmethod
+    def _cache_key(query: str, check_in: str = None, check_out: str = None) -> Tuple[str, str, str]:
+        normalized = " ".join(query.lower().split())
+        return QUERY_NOISE.sub("", normalized), check_in or "", check_out or ""
+
     def search_hotels(self, query: str, check_in: str = None, check_out: str = None) -> List[Dict[str, Any]]:
         """
-        Searches for hotels using SerpApi.
+        Searches for hotels using SerpApi, serving repeated searches from a TTL cache.
+        Concurrent identical searches share one in-flight SerpApi request.
         
         Args:
             query: The location or hotel name to search for.
             check_in: Check-in date (YYYY-MM-DD).
             check_out: Check-out date (YYYY-MM-DD).
         """
+        key = self._cache_key(query, check_in, check_out)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                count("cache_events", cache="search", result="hit")
+                return cached[1]
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            count("cache_events", cache="search", result="in_flight")
+            return pending.result()
+
+        count("cache_events", cache="search", result="miss")
+
+        try:
+            hotels = self._fetch(query, check_in, check_out)
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(hotels)
+            # Empty results usually mean a SerpApi error; don't pin them for a whole TTL
+            if hotels:
+                with self._lock:
+                    now = time.monotonic()
+                    if len(self._cache) > 256:
+                        self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.cache_ttl}
+                    self._cache[key] = (now, hotels)
+            return hotels
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _fetch(self, query: str, check_in: str = None, check_out: str = None) -> List[Dict[str, Any]]:
+        """Runs one uncached SerpApi Google Hotels request."""
         params = {
             "engine": "google_hotels",
             "q": query,
@@ -33,13 +116,19 @@ class HotelSearchTool:
         if check_out:
             params["check_out_date"] = check_out
 
-        print(f"DEBUG: Searching hotels with query: {query}", file=sys.stderr)
+        logger.debug(f"Searching hotels with query: {query}")
         search = GoogleSearch(params)
-        results = search.get_dict()
-        print(f"DEBUG: SerpApi Raw Results Keys: {results.keys()}", file=sys.stderr)
+        if self.base_url:
+            search.BACKEND = self.base_url
+        with span("serpapi_request", engine="google_hotels"):
+            results = search.get_dict()
+        logger.debug(f"SerpApi Raw Results Keys: {results.keys()}")
         if "error" in results:
-             print(f"DEBUG: SerpApi Error: {results['error']}", file=sys.stderr)
+            count("serpapi_errors")
+            logger.warning(f"SerpApi Error: {results['error']}")
         
+        # Wall-clock time, so answers quoting these prices can expire with them
+        fetched_at = int(time.time())
         hotels = []
         if "properties" in results:
             for prop in results["properties"]:
@@ -47,14 +136,101 @@ class HotelSearchTool:
                     "name": prop.get("name"),
                     "description": prop.get("description", ""),
                     "price": prop.get("rate_per_night", {}).get("lowest", "N/A"),
+                    "price_value": prop.get("rate_per_night", {}).get("extracted_lowest"),
                     "rating": prop.get("overall_rating"),
                     "reviews": prop.get("reviews"),
                     "link": prop.get("link"),
-                    "amenities": prop.get("amenities", [])
+                    # Identify the property when merging searches (names repeat across cities)
+                    "property_token": prop.get("property_token"),
+                    "gps_coordinates": prop.get("gps_coordinates"),
+                    "amenities": prop.get("amenities", []),
+                    "fetched_at": fetched_at,
                 }
                 hotels.append(hotel)
-        
-        return hotels[:10]  # Return top 10 results
+
+        hotels = hotels[:10]  # Return top 10 results
+        # Precompute dated deep links so the agent doesn't need a book_hotel call per result
+        links = self.booking_tool.generate_booking_links([h["name"] for h in hotels if h["name"]], check_in, check_out)
+        for hotel in hotels:
+            hotel["booking_link"] = links.get(hotel["name"])
+        return hotels
+
+    def search_many(
+        self,
+        queries: List[str],
+        check_in: str = None,
+        check_out: str = None,
+        check_in_dates: Optional[List[str]] = None,
+        nights: int = 1,
+        limit: int = 15,
+    ) -> Dict[str, Any]:
+        """
+        Runs every query x check-in date combination concurrently and merges the
+        results into one ranked table with the cheapest night per property.
+
+        Args:
+            queries: Locations or hotel names to compare.
+            check_in: Check-in date (YYYY-MM-DD) when not using a date grid.
+            check_out: Check-out date (YYYY-MM-DD) when not using a date grid.
+            check_in_dates: Flexible check-in dates (YYYY-MM-DD); each stays `nights` nights.
+            nights: Length of stay for `check_in_dates` (at least 1).
+            limit: Maximum number of rows returned.
+        """
+        if check_in_dates:
+            if nights < 1:
+                raise ValueError(f"nights must be at least 1, got {nights}.")
+            stays = [
+                (d, (date.fromisoformat(d) + timedelta(days=nights)).isoformat())
+                for d in check_in_dates
+            ]
+        else:
+            stays = [(check_in, check_out)]
+
+        searches = list(dict.fromkeys((q, ci, co) for q in queries for ci, co in stays))
+        if len(searches) > self.max_fanout:
+            raise ValueError(
+                f"{len(searches)} searches requested, the limit is {self.max_fanout}. "
+                "Narrow the destinations or dates."
+            )
+
+        # Identical searches share the cache and in-flight requests of search_hotels
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(searches)))) as pool:
+            futures = {s: pool.submit(self.search_hotels, *s) for s in searches}
+
+        # One row per property; `query` records the search that found its cheapest night
+        best: Dict[str, Dict[str, Any]] = {}
+        failed = []
+        fetched_at = []
+        for (query, ci, co), future in futures.items():
+            try:
+                hotels = future.result()
+            except Exception as e:
+                failed.append({"query": query, "check_in": ci, "check_out": co, "error": str(e)})
+                continue
+            fetched_at.extend(h["fetched_at"] for h in hotels[:1] if "fetched_at" in h)
+            for hotel in hotels:
+                if not hotel.get("name"):
+                    continue
+                key = self._property_key(hotel)
+                current = best.get(key)
+                price = hotel.get("price_value")
+                if current is None or (price is not None and (current["price_value"] is None or price < current["price_value"])):
+                    best[key] = {**hotel, "query": query, "check_in": ci or "", "check_out": co or ""}
+
+        ranked = sorted(best.values(), key=lambda h: (h["price_value"] is None, h["price_value"] or 0, -(h.get("rating") or 0)))
+        columns = ["name", "query", "cheapest_night", "check_in", "check_out", "rating", "reviews", "booking_link"]
+        rows = [
+            [h["name"], h["query"], h["price"], h["check_in"], h["check_out"], h.get("rating"), h.get("reviews"), h.get("booking_link")]
+            for h in ranked[:limit]
+        ]
+        return {
+            "searches": len(searches),
+            "failed": failed,
+            # Oldest search in the table; cached answers quoting it expire with it
+            "fetched_at": min(fetched_at) if fetched_at else None,
+            "columns": columns,
+            "rows": rows,
+        }
 
 if __name__ == "__main__":
     # Test
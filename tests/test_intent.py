@@ -0,0 +1,71 @@
+from datetime import date
+
+from src.intent import extract_dates, extract_intent, extract_places, extract_qualifiers
+
+# A Sunday, so "this weekend" and "next weekend" differ from the weekday cases
+TODAY = date(2026, 10, 18)
+
+def test_iso_dates():
+    assert extract_dates("from 2030-03-01 to 2030-03-04") == ("2030-03-01", "2030-03-04")
+
+def test_nights_after_check_in():
+    assert extract_dates("from 2024-05-01 for 3 nights") == ("2024-05-01", "2024-05-04")
+
+def test_single_date_defaults_to_one_night():
+    assert extract_dates("arriving 2030-12-31") == ("2030-12-31", "2031-01-01")
+
+def test_invalid_check_in_is_missing():
+    assert extract_dates("from 2030-02-30 for 2 nights") == ("", "")
+
+def test_invalid_check_out_is_missing():
+    assert extract_dates("from 2030-02-27 to 2030-02-30") == ("", "")
+
+def test_no_dates():
+    assert extract_dates("somewhere quiet", today=TODAY) == ("", "")
+
+def test_tomorrow():
+    assert extract_dates("tomorrow for 2 nights", today=TODAY) == ("2026-10-19", "2026-10-21")
+
+def test_weekend_on_weekday():
+    wednesday = date(2026, 10, 14)
+    assert extract_dates("this weekend", today=wednesday) == ("2026-10-16", "2026-10-18")
+
+def test_weekend_on_saturday_is_current_weekend():
+    saturday = date(2026, 10, 17)
+    assert extract_dates("this weekend", today=saturday) == ("2026-10-17", "2026-10-18")
+
+def test_weekend_on_sunday_is_current_weekend():
+    assert extract_dates("this weekend", today=TODAY) == ("2026-10-18", "2026-10-19")
+
+def test_next_weekend_on_sunday():
+    assert extract_dates("next weekend", today=TODAY) == ("2026-10-23", "2026-10-25")
+
+def test_next_weekend_on_friday():
+    friday = date(2026, 10, 16)
+    assert extract_dates("next weekend", today=friday) == ("2026-10-23", "2026-10-25")
+
+def test_intent_with_location_and_dates():
+    assert extract_intent("cheap hotels in New York from 2024-05-01 for 3 nights") == {
+        "query": "New York", "check_in": "2024-05-01", "check_out": "2024-05-04",
+    }
+
+def test_intent_with_invalid_date_keeps_location():
+    assert extract_intent("hotels in Osaka on 2030-02-30") == {"query": "Osaka", "check_in": "", "check_out": ""}
+
+def test_intent_without_location():
+    assert extract_intent("something cheap this weekend", today=TODAY) is None
+
+def test_month_is_not_a_location():
+    assert extract_intent("something in March in Tokyo")["query"] == "Tokyo"
+
+def test_day_name_is_not_a_location():
+    assert extract_intent("arriving on Friday, staying at Sunday") is None
+    assert extract_intent("hotels at Christmas near Shinjuku Station")["query"] == "Shinjuku Station"
+
+def test_several_places():
+    assert extract_places("Compare hotels in Osaka, Kyoto and Nara") == ["Osaka", "Kyoto", "Nara"]
+    assert extract_places("I need a hotel in Osaka and I want a pool") == ["Osaka"]
+
+def test_qualifiers():
+    assert extract_qualifiers("Find cheap hotels in Osaka with Breakfast") == ["breakfast", "cheap"]
+    assert extract_qualifiers("I need a hotel in Osaka") == []
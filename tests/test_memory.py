@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeRedis, HashEncoder
+from src.memory import RedisMemory
+
+DATES = "from 2030-01-01 to 2030-01-03"
+
+@pytest.fixture
+def memory():
+    return RedisMemory(redis_client=FakeRedis(), encoder=HashEncoder())
+
+def test_rephrased_question_hits(memory):
+    memory.cache_answer(f"Find cheap hotels in Osaka {DATES}", "cheap answer", "en-US")
+    assert memory.lookup_answer(f"Find cheap hotels in Osaka {DATES}", "en-US") == "cheap answer"
+
+def test_qualifiers_are_part_of_the_key(memory):
+    memory.cache_answer(f"Find cheap hotels in Osaka {DATES}", "cheap answer", "en-US")
+    assert memory.lookup_answer(f"Find luxury hotels in Osaka {DATES}", "en-US") is None
+
+def test_other_place_or_dates_miss(memory):
+    memory.cache_answer(f"Find cheap hotels in Osaka {DATES}", "cheap answer", "en-US")
+    assert memory.lookup_answer(f"Find cheap hotels in Kyoto {DATES}", "en-US") is None
+    assert memory.lookup_answer("Find cheap hotels in Osaka from 2030-01-02 to 2030-01-03", "en-US") is None
+
+def test_comparisons_are_not_cached(memory):
+    memory.cache_answer(f"Compare hotels in Osaka and Kyoto {DATES}", "comparison", "en-US")
+    assert memory.lookup_answer(f"Compare hotels in Osaka and Nara {DATES}", "en-US") is None
+    assert memory.lookup_answer(f"Compare hotels in Osaka and Kyoto {DATES}", "en-US") is None
+
+def test_follow_ups_are_not_cached(memory):
+    memory.cache_answer("Which of those has the best rating?", "follow-up", "en-US")
+    assert memory.lookup_answer("Which of those has the best rating?", "en-US") is None
+
+def test_answer_expires_with_the_search_it_quotes(memory):
+    question = f"Find cheap hotels in Osaka {DATES}"
+    memory.cache_answer(question, "stale", "en-US", fetched_at=time.time() - memory.cache_ttl - 1)
+    assert memory.lookup_answer(question, "en-US") is None
+
+    memory.cache_answer(question, "fresh", "en-US", fetched_at=time.time() - memory.cache_ttl + 60)
+    (key,) = memory.redis_client.keys("answer:*")
+    remaining = memory.redis_client.expiry[key.decode()] - time.monotonic()
+    assert 0 < remaining <= 60
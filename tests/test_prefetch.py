@@ -0,0 +1,38 @@
+import asyncio
+from datetime import date, timedelta
+
+from src.prefetch import SearchPrefetcher
+
+class RecordingManager:
+    def __init__(self):
+        self.calls = []
+
+    async def call_tool(self, name, args):
+        self.calls.append((name, args))
+        return "[]"
+
+def prefetch(text):
+    manager = RecordingManager()
+
+    async def run():
+        task = SearchPrefetcher(manager, budget=10).maybe_prefetch(text)
+        if task:
+            await task
+        return task
+
+    return asyncio.run(run()), manager.calls
+
+CHECK_IN = (date.today() + timedelta(days=30)).isoformat()
+
+def test_plain_search_is_prefetched():
+    task, calls = prefetch(f"I need a hotel in Osaka from {CHECK_IN} for 2 nights")
+    assert task is not None
+    assert calls[0][1]["query"] == "Osaka"
+
+def test_qualified_search_is_not_prefetched():
+    task, calls = prefetch(f"Find cheap hotels in Osaka from {CHECK_IN} for 2 nights")
+    assert task is None and calls == []
+
+def test_past_check_in_is_not_prefetched():
+    task, calls = prefetch("I need a hotel in Osaka from 2020-01-01 for 2 nights")
+    assert task is None and calls == []
@@ -0,0 +1,48 @@
+import pytest
+
+from src.tools.search import HotelSearchTool
+
+@pytest.fixture
+def tool(monkeypatch):
+    monkeypatch.setenv("SERPAPI_KEY", "test")
+    return HotelSearchTool()
+
+def hotel(name, price, token=None, rating=None):
+    return {"name": name, "price": f"¥{price}" if price else "N/A", "price_value": price,
+            "rating": rating, "property_token": token, "fetched_at": 100}
+
+def run(tool, results, queries, **kwargs):
+    tool.search_hotels = lambda query, check_in=None, check_out=None: results[query]
+    return tool.search_many(queries, "2030-01-01", "2030-01-02", **kwargs)
+
+def test_same_name_in_different_cities_stays_separate(tool):
+    table = run(tool, {
+        "Osaka": [hotel("Toyoko Inn", 7000, token="osaka-1")],
+        "Kyoto": [hotel("Toyoko Inn", 8000, token="kyoto-1")],
+    }, ["Osaka", "Kyoto"])
+    assert [(row[0], row[1]) for row in table["rows"]] == [("Toyoko Inn", "Osaka"), ("Toyoko Inn", "Kyoto")]
+
+def test_overlapping_searches_keep_the_cheapest_row(tool):
+    table = run(tool, {
+        "Shinjuku": [hotel("Hotel A", 9000, token="a")],
+        "Tokyo": [hotel("Hotel A", 7000, token="a"), hotel("Hotel B", 8000, token="b")],
+    }, ["Shinjuku", "Tokyo"])
+    assert [(row[0], row[1], row[2]) for row in table["rows"]] == [("Hotel A", "Tokyo", "¥7000"), ("Hotel B", "Tokyo", "¥8000")]
+
+def test_name_is_the_fallback_identity(tool):
+    table = run(tool, {"Osaka": [hotel("Hotel A", 9000)], "Umeda": [hotel("hotel  a", 8000)]}, ["Osaka", "Umeda"])
+    assert len(table["rows"]) == 1
+
+def test_ranking_by_price_then_rating_unpriced_last(tool):
+    table = run(tool, {"Osaka": [
+        hotel("No price", None, token="n", rating=5.0),
+        hotel("Low rated", 7000, token="l", rating=3.0),
+        hotel("High rated", 7000, token="h", rating=4.5),
+        hotel("Cheapest", 6000, token="c"),
+    ]}, ["Osaka"])
+    assert [row[0] for row in table["rows"]] == ["Cheapest", "High rated", "Low rated", "No price"]
+    assert table["fetched_at"] == 100
+
+def test_date_grid_needs_at_least_one_night(tool):
+    with pytest.raises(ValueError):
+        run(tool, {}, ["Osaka"], check_in_dates=["2030-01-01"], nights=0)